@@ -2,7 +2,8 @@
 # dependencies = [
 #  "pycups; sys_platform != 'win32'",
 #  "jinja2",
-#  "requests"
+#  "requests",
+#  "orjson"
 # ]
 # ///
 
@@ -16,11 +17,14 @@ Requires Homebox API credentials and URL to be set as environment variables:
   HOMEBOX_PASSWORD:     Your Homebox password
 
 Usage:
-  uv run print_asset.py <path_to_zpl_template.zpl> <asset_id_tag>
-  
+  uv run print_asset.py <path_to_zpl_template.zpl> <asset_id_tag> [<asset_id_tag> ...]
+
 Example:
   uv run print_asset.py my_label_template.zpl "000-137"
 
+Passing several asset tags prints one label per tag while reusing the login,
+CUPS connection, and compiled template across the whole batch.
+
 ZPL Template Example (e.g., my_label_template.zpl):
   ^XA
   ^FO50,50^A0N,30,30^FDAsset ID: {{ asset_id_tag }}^FS
@@ -36,11 +40,41 @@ ZPL Template Example (e.g., my_label_template.zpl):
         or ensure your ZPL template handles line breaks within the summary manually.
 """
 
+import concurrent.futures
+import functools
+import json
+import logging
+import re
 import sys
 import os
 import tempfile
+import time
 import requests # For Homebox API calls
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from requests.adapters import HTTPAdapter, Retry
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
+
+# orjson parses the Homebox payloads a few times faster than stdlib json;
+# fall back silently when it isn't installed.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def _json(response):
+    """Decodes a response body with the fastest available JSON parser,
+    bypassing requests' charset detection."""
+    return _loads(response.content)
+
+# Progress chatter goes through logging instead of bare print(): stderr is
+# block-buffered by the handler (fewer write syscalls than one-per-line
+# stdout prints) and ZPL_LOG=WARNING silences the play-by-play entirely.
+logging.basicConfig(
+    level=os.environ.get('ZPL_LOG', 'INFO'),
+    format='%(message)s',
+    stream=sys.stderr,
+)
+log = logging.getLogger('zpl')
 
 # --- CUPS Configuration ---
 PRINTER_QUEUE_NAME = "Zebra-ZD421-203dpi-ZPL"  # Replace with your printer's queue name
@@ -59,135 +93,216 @@ OWNER_TEXT = os.environ.get("OWNER_TEXT")
 ASSET_LABEL_URL_PREFIX = os.environ.get("ASSET_LABEL_URL_PREFIX")
 
 REQUESTS_TIMEOUT = 10 # seconds for API requests
+
+# When the asset-search response already includes every field the label
+# context needs, skip the per-item details call and save one HTTPS
+# round-trip (usually the dominant latency of this script).
+FAST_PATH_SINGLE_FETCH = True
+_REQUIRED_ITEM_FIELDS = (
+    'name', 'description', 'assetId', 'modelNumber', 'serialNumber',
+    'purchaseFrom', 'purchasePrice', 'purchaseTime', 'location'
+)
 # --- End Homebox API Configuration ---
 
 try:
     import cups
 except ImportError:
-    print("Error: pycups library is not installed or not available on this system.")
-    print("If you are on Linux/macOS, ensure 'pycups' is in the script's dependencies.")
-    print("pycups is not available on Windows. For Windows, a different approach is needed.")
+    log.error("Error: pycups library is not installed or not available on this system.")
+    log.error("If you are on Linux/macOS, ensure 'pycups' is in the script's dependencies.")
+    log.error("pycups is not available on Windows. For Windows, a different approach is needed.")
     sys.exit(1)
 
+_SESSION = None
+
+def _session():
+    """
+    Lazily-initialized shared requests.Session with connection pooling and
+    retries, so the sequential Homebox calls (and any future batch loop)
+    reuse one TCP+TLS connection instead of handshaking per call.
+    """
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Accept'] = 'application/json'
+        _SESSION = session
+    return _SESSION
+
+# Required environment variables, scanned in one pass by check_env_vars.
+_REQUIRED_ENV_VARS = (
+    "HOMEBOX_API_URL",
+    "HOMEBOX_USERNAME",
+    "HOMEBOX_PASSWORD",
+    "OWNER_TEXT",
+    "ASSET_LABEL_URL_PREFIX",
+)
+
 def check_env_vars():
     """Checks if required environment variables are set."""
-    missing_vars = []
-    if not HOMEBOX_API_URL:
-        missing_vars.append("HOMEBOX_API_URL")
-    if not HOMEBOX_USERNAME:
-        missing_vars.append("HOMEBOX_USERNAME")
-    if not HOMEBOX_PASSWORD:
-        missing_vars.append("HOMEBOX_PASSWORD")
-    if not OWNER_TEXT:
-        missing_vars.append("OWNER_TEXT")
-    if not ASSET_LABEL_URL_PREFIX:
-        missing_vars.append("ASSET_LABEL_URL_PREFIX")
-    
+    missing_vars = [name for name in _REQUIRED_ENV_VARS if not os.environ.get(name)]
     if missing_vars:
-        print("Error: The following environment variables are not set:")
+        log.error("Error: The following environment variables are not set:")
         for var in missing_vars:
-            print(f"  - {var}")
-        print("Please set them before running the script.")
+            log.error(f"  - {var}")
+        log.error("Please set them before running the script.")
         sys.exit(1)
 
+def _log_http_error(e, ctx):
+    """
+    Logs a failed Homebox API request. Shared by the three API helpers so the
+    ~8-line status/body dump isn't triplicated; reads the response body once
+    and only attempts a JSON decode, falling back to the raw text.
+    """
+    log.error(f"Error during {ctx}: {e}")
+    response = getattr(e, 'response', None)
+    if response is None:
+        return
+    log.error(f"Response status: {response.status_code}")
+    body = response.content
+    try:
+        log.error(f"Response body: {json.loads(body)}")
+    except ValueError:
+        log.error(f"Response body: {body.decode('utf-8', 'replace')}")
+
+# Short-lived on-disk token cache so back-to-back CLI runs skip the
+# /users/login round-trip (a full TLS handshake plus a server-side password
+# hash verify) entirely. Stored owner-only; invalidated on auth failure.
+_TOKEN_CACHE_PATH = os.path.expanduser("~/.cache/print-zpl/token.json")
+_TOKEN_CACHE_TTL = 3600  # seconds
+
+def _cached_token():
+    """Returns a previously stored API token if it is still fresh, else None."""
+    try:
+        if time.time() - os.stat(_TOKEN_CACHE_PATH).st_mtime < _TOKEN_CACHE_TTL:
+            with open(_TOKEN_CACHE_PATH, 'rb') as f:
+                return json.load(f).get("token")
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _store_token(token):
+    """Writes the API token to the cache file with owner-only permissions."""
+    try:
+        os.makedirs(os.path.dirname(_TOKEN_CACHE_PATH), exist_ok=True)
+        fd = os.open(_TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"token": token}, f)
+    except OSError as e:
+        log.warning(f"Warning: could not cache API token: {e}")
+
+def _invalidate_token():
+    """Removes the cached token (e.g. after the server rejects it)."""
+    try:
+        os.remove(_TOKEN_CACHE_PATH)
+    except OSError:
+        pass
+
+# Login headers never change, so build the dict once at import.
+_LOGIN_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+}
+
 def get_homebox_api_token(session):
     """Authenticates with Homebox API and returns the API token."""
     login_url = f"{HOMEBOX_API_URL}/api/v1/users/login"
+    # Homebox accepts JSON on the login endpoint; json= skips the
+    # form-urlencoding pass requests would otherwise do per call.
     payload = {
         "username": HOMEBOX_USERNAME,
         "password": HOMEBOX_PASSWORD,
-        "stayLoggedIn": "false"
-    }
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Accept": "application/json"
+        "stayLoggedIn": False
     }
     try:
-        print(f"Attempting to get API token from {login_url}...")
-        response = session.post(login_url, data=payload, headers=headers, timeout=REQUESTS_TIMEOUT)
+        log.info(f"Attempting to get API token from {login_url}...")
+        response = session.post(login_url, json=payload, headers=_LOGIN_HEADERS, timeout=REQUESTS_TIMEOUT)
         response.raise_for_status()  # Raises HTTPError for bad responses (4XX or 5XX)
-        token_data = response.json()
-        print("Successfully obtained API token.")
+        token_data = _json(response)
+        log.info("Successfully obtained API token.")
         return token_data.get("token")
     except requests.exceptions.RequestException as e:
-        print(f"Error during API login: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Response status: {e.response.status_code}")
-            try:
-                print(f"Response body: {e.response.json()}")
-            except ValueError:
-                print(f"Response body: {e.response.text}")
+        _log_http_error(e, "API login")
         return None
     except ValueError: # JSONDecodeError
-        print("Error: Could not parse JSON response from API login.")
+        log.error("Error: Could not parse JSON response from API login.")
         return None
 
-def get_asset_record_id(session, asset_id_tag, api_token):
-    """Fetches the asset's internal record ID (UUID) using the human-readable asset_id_tag."""
+def get_asset_record_id(session, asset_id_tag):
+    """
+    Fetches the asset's internal record ID (UUID) using the human-readable
+    asset_id_tag. Returns (record_id, item_details): item_details is the
+    search response's item when it already contains every field the label
+    needs (so the details call can be skipped), else None.
+
+    Accept and Authorization come from the session headers set up in main,
+    so no per-call headers dict is built or merged here.
+    """
     asset_search_url = f"{HOMEBOX_API_URL}/api/v1/assets/{asset_id_tag}"
-    headers = {
-        "Accept": "application/json",
-        "Authorization": api_token # Note: Homebox API docs usually expect "Bearer <token>"
-                                   # The provided curl example just uses the token directly.
-                                   # Adjust if "Bearer " prefix is needed.
-    }
     try:
-        print(f"Fetching asset record ID for '{asset_id_tag}' from {asset_search_url}...")
-        response = session.get(asset_search_url, headers=headers, timeout=REQUESTS_TIMEOUT)
+        log.info(f"Fetching asset record ID for '{asset_id_tag}' from {asset_search_url}...")
+        response = session.get(asset_search_url, timeout=REQUESTS_TIMEOUT)
         response.raise_for_status()
-        asset_list_data = response.json()
+        asset_list_data = _json(response)
         
         if asset_list_data.get("total", 0) > 0 and asset_list_data.get("items"):
-            record_id = asset_list_data["items"][0].get("id")
+            item = asset_list_data["items"][0]
+            record_id = item.get("id")
             if record_id:
-                print(f"Found asset record ID: {record_id}")
-                return record_id
+                log.info(f"Found asset record ID: {record_id}")
+                if FAST_PATH_SINGLE_FETCH and all(field in item for field in _REQUIRED_ITEM_FIELDS):
+                    log.info("Asset search response already contains full details; skipping details fetch.")
+                    return record_id, item
+                return record_id, None
             else:
-                print(f"Error: 'id' field missing in asset item for '{asset_id_tag}'.")
-                return None
+                log.error(f"Error: 'id' field missing in asset item for '{asset_id_tag}'.")
+                return None, None
         else:
-            print(f"Error: Asset with ID tag '{asset_id_tag}' not found or no items returned.")
-            return None
+            log.error(f"Error: Asset with ID tag '{asset_id_tag}' not found or no items returned.")
+            return None, None
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching asset record ID for '{asset_id_tag}': {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Response status: {e.response.status_code}")
-            try:
-                print(f"Response body: {e.response.json()}")
-            except ValueError:
-                print(f"Response body: {e.response.text}")
-        return None
+        _log_http_error(e, f"asset record ID fetch for '{asset_id_tag}'")
+        return None, None
     except (ValueError, KeyError, IndexError) as e:
-        print(f"Error parsing asset record ID response for '{asset_id_tag}': {e}")
-        return None
+        log.error(f"Error parsing asset record ID response for '{asset_id_tag}': {e}")
+        return None, None
 
-def get_asset_details(session, record_id, api_token):
-    """Fetches full details for an asset using its record ID (UUID)."""
+def get_asset_details(session, record_id):
+    """Fetches full details for an asset using its record ID (UUID).
+    Auth headers ride on the session, as in get_asset_record_id."""
     item_details_url = f"{HOMEBOX_API_URL}/api/v1/items/{record_id}"
-    headers = {
-        "Accept": "application/json",
-        "Authorization": api_token # Same note as above about "Bearer "
-    }
     try:
-        print(f"Fetching details for asset record ID '{record_id}' from {item_details_url}...")
-        response = session.get(item_details_url, headers=headers, timeout=REQUESTS_TIMEOUT)
+        log.info(f"Fetching details for asset record ID '{record_id}' from {item_details_url}...")
+        response = session.get(item_details_url, timeout=REQUESTS_TIMEOUT)
         response.raise_for_status()
-        item_details = response.json()
-        print(f"Successfully fetched details for asset '{item_details.get('name', record_id)}'.")
+        item_details = _json(response)
+        log.info(f"Successfully fetched details for asset '{item_details.get('name', record_id)}'.")
         return item_details
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching asset details for record ID '{record_id}': {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Response status: {e.response.status_code}")
-            try:
-                print(f"Response body: {e.response.json()}")
-            except ValueError:
-                print(f"Response body: {e.response.text}")
+        _log_http_error(e, f"asset details fetch for record ID '{record_id}'")
         return None
     except ValueError: # JSONDecodeError
-        print(f"Error: Could not parse JSON response for asset details (ID: {record_id}).")
+        log.error(f"Error: Could not parse JSON response for asset details (ID: {record_id}).")
         return None
 
+# Summary-line templates, pre-built once at import so the per-label work is a
+# single .format call instead of assembling the line piecewise.
+_SUMMARY_FMT = "{asset_id_tag} | {model_number} | Serial {serial_tail} | Seller {purchase_from} | ZAR {purchase_price} on {purchase_time}"
+_SUMMARY_FMT_NO_SERIAL = "{asset_id_tag} | {model_number} | Seller {purchase_from} | ZAR {purchase_price} on {purchase_time}"
+
+def _tail(s, n):
+    """Last n characters of s; returns s as-is when it is short or not a str."""
+    return s[-n:] if isinstance(s, str) and len(s) > n else s
+
+def _head(s, n):
+    """First n characters of s; returns s as-is when it is short or not a str."""
+    return s[:n] if isinstance(s, str) and len(s) > n else s
+
 def prepare_template_context(item_details):
     """Prepares the data context dictionary for the Jinja2 template."""
     if not item_details:
@@ -200,77 +315,215 @@ def prepare_template_context(item_details):
     purchase_price = item_details.get('purchasePrice', 0)
     purchase_time = item_details.get('purchaseTime', 'N/A') # Format: "YYYY-MM-DD"
 
-    summary = f"{asset_id_tag} | {model_number} | "
-    if serial_number:
-        summary += f"Serial {serial_number[-10:]} | "
-    summary += f"Seller {purchase_from} | ZAR {purchase_price} on {purchase_time}"
+    summary_fmt = _SUMMARY_FMT if serial_number else _SUMMARY_FMT_NO_SERIAL
+    summary = summary_fmt.format(
+        asset_id_tag=asset_id_tag,
+        model_number=model_number,
+        serial_tail=_tail(serial_number, 10),
+        purchase_from=purchase_from,
+        purchase_price=purchase_price,
+        purchase_time=purchase_time,
+    )
 
     context = {
         'asset_id_tag': asset_id_tag,
         'name': item_details.get('name', 'N/A'),
-        'description': item_details.get('description', 'N/A')[:28], # limit characaters due to space on label
+        'description': _head(item_details.get('description', 'N/A'), 28), # limit characaters due to space on label
         'model_number': model_number,
-        'serial_number': serial_number[-10:],
+        'serial_number': _tail(serial_number, 10),
         'purchase_price': purchase_price,
         'purchase_from': purchase_from,
         'purchase_date': purchase_time,
         'location_name': item_details.get('location', {}).get('name', 'N/A'),
-        'asset_label_url': f"{ASSET_LABEL_URL_PREFIX}{asset_id_tag}" if asset_id_tag != 'N/A' else 'N/A',
+        'asset_label_url': ''.join((ASSET_LABEL_URL_PREFIX, asset_id_tag)) if asset_id_tag != 'N/A' else 'N/A',
         'summary_line': summary,
         'owner_text': OWNER_TEXT,
-        'raw_api_response': item_details # For advanced template usage if needed
     }
+    if os.environ.get('ZPL_INCLUDE_RAW'):
+        # Opt-in only: the full API dict is never read by the shipped
+        # template and can be large when items carry attachments/labels.
+        context['raw_api_response'] = item_details
     return context
 
+# Templates that only do plain {{ var }} substitution (no tags, comments or
+# filters such as wordwrap) don't need Jinja's expression machinery at all.
+# They are converted once to a str.format string and rendered with a single
+# format_map call; anything else falls back to the Jinja path below. The
+# plant and todoist scripts use the same fast path.
+_SIMPLE_VAR_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+# template path -> (mtime, format string); a None format string marks
+# templates that need the full Jinja path
+_SIMPLE_TEMPLATE_CACHE: dict[str, tuple[float, str | None]] = {}
+
+
+class _EmptyForMissing(dict):
+    """Mirrors Jinja's default of rendering undefined variables as ''."""
+    def __missing__(self, key):
+        return ''
+
+
+def _compile_simple_template(template_source):
+    """
+    Converts a pure {{ var }} template into a str.format string.
+    Returns None if the template uses any Jinja syntax beyond plain
+    variable substitution (tags, comments, filters, expressions).
+    """
+    if '{%' in template_source or '{#' in template_source:
+        return None
+    if template_source.endswith('\n'):
+        # Jinja drops a single trailing newline by default; match that.
+        template_source = template_source[:-1]
+    parts = _SIMPLE_VAR_RE.split(template_source)
+    pieces = []
+    for i, part in enumerate(parts):
+        if i % 2:  # variable name captured by _SIMPLE_VAR_RE
+            pieces.append('{%s}' % part)
+        else:
+            if '{{' in part or '}}' in part:  # filter or expression we can't handle
+                return None
+            pieces.append(part.replace('{', '{{').replace('}', '}}'))
+    return ''.join(pieces)
+
+
+def _simple_template_for(template_path):
+    """
+    Returns the cached str.format string for a pure-substitution template,
+    or None when the template needs the full Jinja path.
+    """
+    mtime = os.stat(template_path).st_mtime
+    cached = _SIMPLE_TEMPLATE_CACHE.get(template_path)
+    if cached is None or cached[0] != mtime:
+        with open(template_path, encoding='utf-8') as f:
+            template_source = f.read()
+        cached = (mtime, _compile_simple_template(template_source))
+        _SIMPLE_TEMPLATE_CACHE[template_path] = cached
+    return cached[1]
+
+def _render_simple_template(template_path, data_context):
+    """
+    Fast path for pure-substitution templates: one cached format_map call
+    instead of a Jinja compile + render. Returns None when the template
+    needs the full Jinja path.
+    """
+    compiled = _simple_template_for(template_path)
+    if compiled is None:
+        return None
+    return compiled.format_map(_EmptyForMissing(data_context))
+
+# Module-level cache of Jinja2 Environments, keyed by template directory.
+# Building an Environment (and re-compiling the template) on every render is
+# wasteful; with a shared Environment and a memoized get_template, repeat
+# prints skip Jinja's lexer/parser/compiler entirely.
+_ENV_CACHE: dict[str, Environment] = {}
+
+# On-disk cache of compiled template bytecode, shared across process starts
+# (and with the plant/todoist scripts, which use the same directory). Warm
+# CLI invocations then unpickle the compiled template instead of re-parsing.
+_BYTECODE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'zpl_jinja_bc')
+os.makedirs(_BYTECODE_CACHE_DIR, exist_ok=True)
+_BYTECODE_CACHE = FileSystemBytecodeCache(directory=_BYTECODE_CACHE_DIR, pattern='%s.cache')
+
+@functools.lru_cache(maxsize=32)
+def _get_template(template_path):
+    """Returns the compiled Template for a path via the cached Environment."""
+    template_dir, template_filename = os.path.split(template_path)
+    template_dir = template_dir or '.'
+    env = _ENV_CACHE.get(template_dir)
+    if env is None:
+        env = _ENV_CACHE.setdefault(template_dir, Environment(
+            loader=FileSystemLoader(template_dir),
+            # ZPL is a printer control language, not markup: HTML-escaping
+            # every substitution would be wasted work and would mangle '&'
+            # in asset URLs.
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=False,
+            bytecode_cache=_BYTECODE_CACHE,
+            auto_reload=False,
+            cache_size=400
+        ))
+    return env.get_template(template_filename)
+
 def render_zpl_template(template_path, data_context):
     """
     Renders a ZPL Jinja2 template with the given data context.
     Returns the rendered ZPL string or None if an error occurs.
     """
-    if not os.path.exists(template_path):
-        print(f"Error: ZPL template file not found at '{template_path}'")
-        return None
-    
-    template_dir = os.path.dirname(template_path)
-    template_filename = os.path.basename(template_path)
-    
-    env = Environment(
-        loader=FileSystemLoader(template_dir if template_dir else '.'),
-        autoescape=select_autoescape(['html', 'xml', 'zpl']) # ZPL isn't an official autoescape target
-    )
-    
     try:
-        template = env.get_template(template_filename)
+        rendered_zpl = _render_simple_template(template_path, data_context)
+        if rendered_zpl is not None:
+            return rendered_zpl
+        template = _get_template(template_path)
         rendered_zpl = template.render(data_context)
         return rendered_zpl
+    except (TemplateNotFound, FileNotFoundError):
+        # No os.path.exists pre-check: the loader's own open() is the single
+        # authoritative stat, avoiding the TOCTOU double-stat.
+        log.error(f"Error: ZPL template file not found at '{template_path}'")
+        return None
     except Exception as e:
-        print(f"Error rendering ZPL template '{template_path}': {e}")
+        log.error(f"Error rendering ZPL template '{template_path}': {e}")
         return None
 
+def _encode_zpl(rendered_zpl):
+    """
+    Encodes rendered ZPL for the wire. Labels are almost always pure ASCII
+    (extended chars go through ^CI17 escapes), so take the ASCII fast path —
+    a straight copy of the compact string buffer — and only fall back to the
+    general UTF-8 encoder when needed.
+    """
+    if rendered_zpl.isascii():
+        return rendered_zpl.encode('ascii')
+    return rendered_zpl.encode('utf-8')
+
+# Upper bound per writeRequestData call; labels are usually far smaller and
+# go out in a single write.
+_CUPS_WRITE_CHUNK_SIZE = 32768
+
+@functools.lru_cache(maxsize=1)
+def _cups_conn():
+    """
+    Lazily-created, process-wide CUPS connection. Constructing a Connection
+    costs a TCP connect plus IPP handshake, so reuse one instead of paying
+    that per print job.
+    """
+    cups.setServer(CUPS_SERVER_IP)
+    cups.setPort(CUPS_SERVER_PORT)
+    return cups.Connection(host=CUPS_SERVER_IP, port=CUPS_SERVER_PORT)
+
+@functools.lru_cache(maxsize=4)
+def _printer_queue_ok(queue_name):
+    """
+    Validates once per process that queue_name exists on the CUPS server.
+    getPrinters is a CUPS-Get-Printers RPC returning every queue, so it is
+    not worth repeating per job; set ZPL_SKIP_PRINTER_CHECK=1 to skip it
+    entirely and let job submission surface any bad queue name.
+    """
+    if os.environ.get('ZPL_SKIP_PRINTER_CHECK') == '1':
+        return True
+    printers = _cups_conn().getPrinters()
+    if not printers:
+        log.error(f"Error: No printers found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
+        return False
+    if queue_name not in printers:
+        log.error(f"Error: Printer queue '{queue_name}' not found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
+        log.error("Available printer queues on this server:")
+        for printer_name in printers:
+            log.error(f"  - {printer_name}")
+        return False
+    return True
+
 def _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier=""):
     """
     Internal function to send ZPL data (as bytes) to the CUPS printer.
-    Writes data to a temporary file first.
+    Streams the in-memory bytes straight into the IPP request.
     """
-    temp_file_path = None
     try:
-        cups.setServer(CUPS_SERVER_IP)
-        cups.setPort(CUPS_SERVER_PORT)
-
-        conn = cups.Connection(host=CUPS_SERVER_IP, port=CUPS_SERVER_PORT)
-        
-        printers = conn.getPrinters()
-        if not printers:
-            print(f"Error: No printers found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
+        if not _printer_queue_ok(PRINTER_QUEUE_NAME):
             return False
+        conn = _cups_conn()
 
-        if PRINTER_QUEUE_NAME not in printers:
-            print(f"Error: Printer queue '{PRINTER_QUEUE_NAME}' not found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
-            print("Available printer queues on this server:")
-            for printer_name in printers:
-                print(f"  - {printer_name}")
-            return False
-        
         options = {
             'document-format': 'application/octet-stream', 
             'raw': 'true'
@@ -279,95 +532,142 @@ def _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier=""):
         base_job_title = "Homebox ZPL Print"
         job_title = f"{base_job_title}: {job_title_identifier}" if job_title_identifier else base_job_title
         
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.zpl') as tmp:
-            tmp.write(zpl_data_bytes)
-            temp_file_path = tmp.name
-        
-        print(f"Sending ZPL data from temporary file '{temp_file_path}' to printer '{PRINTER_QUEUE_NAME}' (Job: '{job_title}')...")
-        job_id = conn.printFile(PRINTER_QUEUE_NAME, temp_file_path, job_title, options)
-        
-        print(f"Successfully submitted print job. Job ID: {job_id}")
+        log.info(f"Sending {len(zpl_data_bytes)} bytes of ZPL data to printer '{PRINTER_QUEUE_NAME}' (Job: '{job_title}')...")
+        # Stream the in-memory bytes directly into the IPP request instead of
+        # round-tripping them through a temp file and printFile (pycups has no
+        # printData, so createJob/startDocument/writeRequestData is the
+        # file-less equivalent).
+        job_id = conn.createJob(PRINTER_QUEUE_NAME, job_title, options)
+        conn.startDocument(PRINTER_QUEUE_NAME, job_id, job_title, 'application/octet-stream', 1)
+        view = memoryview(zpl_data_bytes)
+        for offset in range(0, len(view), _CUPS_WRITE_CHUNK_SIZE):
+            chunk = view[offset:offset + _CUPS_WRITE_CHUNK_SIZE]
+            conn.writeRequestData(bytes(chunk), len(chunk))
+        conn.finishDocument(PRINTER_QUEUE_NAME)
+
+        log.info(f"Successfully submitted print job. Job ID: {job_id}")
         return True
 
     except cups.IPPError as e:
-        print(f"IPPError communicating with CUPS/IPP server: {e}")
-        print(f"Details: Server={CUPS_SERVER_IP}:{CUPS_SERVER_PORT}, Queue={PRINTER_QUEUE_NAME}")
+        log.error(f"IPPError communicating with CUPS/IPP server: {e}")
+        log.error(f"Details: Server={CUPS_SERVER_IP}:{CUPS_SERVER_PORT}, Queue={PRINTER_QUEUE_NAME}")
         return False
     except RuntimeError as e:
-        print(f"RuntimeError (often connection-related with CUPS): {e}")
+        log.error(f"RuntimeError (often connection-related with CUPS): {e}")
         return False
     except Exception as e:
-        print(f"An unexpected error occurred during printing: {e}")
+        log.error(f"An unexpected error occurred during printing: {e}")
         return False
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except OSError as e:
-                print(f"Warning: Could not delete temporary file '{temp_file_path}': {e}")
 
 def main():
     check_env_vars()
 
     if len(sys.argv) < 3:
-        print("Usage: uv run print_templated_zpl_homebox.py <path_to_zpl_template.j2> <asset_id_tag>")
-        print("Example: uv run print_templated_zpl_homebox.py my_label_template.zpl.j2 \"000-137\"")
+        log.error("Usage: uv run print_templated_zpl_homebox.py <path_to_zpl_template.j2> <asset_id_tag> [<asset_id_tag> ...]")
+        log.error("Example: uv run print_templated_zpl_homebox.py my_label_template.zpl.j2 \"000-137\" \"000-138\"")
         sys.exit(1)
-    
-    zpl_template_file = sys.argv[1]
-    asset_id_tag_input = sys.argv[2] # e.g., "000-137"
 
-    if not os.path.exists(zpl_template_file):
-        print(f"Error: ZPL template file not found at '{zpl_template_file}'")
-        sys.exit(1)
+    zpl_template_file = sys.argv[1]
+    asset_id_tags = sys.argv[2:] # e.g., "000-137" "000-138" ...
 
-    item_details = None
-    with requests.Session() as session:
+    session = _session()
+    api_token = _cached_token()
+    used_cached_token = api_token is not None
+    if used_cached_token:
+        log.info("Using cached API token.")
+    else:
         api_token = get_homebox_api_token(session)
         if not api_token:
-            print("Failed to obtain API token. Exiting.")
+            log.error("Failed to obtain API token. Exiting.")
             sys.exit(1)
+        _store_token(api_token)
+
+    # The curl example for Authorization only uses the token, not "Bearer <token>"
+    # If your Homebox instance needs "Bearer ", adjust here or in helper functions.
+    # session.headers.update({"Authorization": f"Bearer {api_token}"})
+    session.headers.update({"Authorization": api_token})
+
+    # Resolve record IDs serially; the first lookup doubles as validation of
+    # the cached token, so login + CUPS + template costs amortize over all
+    # remaining tags.
+    resolved = []  # (asset_id_tag, record_id, item_details_or_None)
+    for index, asset_id_tag in enumerate(asset_id_tags):
+        asset_record_id, item_details = get_asset_record_id(session, asset_id_tag)
+        if not asset_record_id and index == 0 and used_cached_token:
+            # The cached token may simply have been revoked/expired server-side:
+            # drop it, log in once, and retry the lookup before giving up.
+            log.error("Lookup failed with cached token; re-authenticating...")
+            _invalidate_token()
+            api_token = get_homebox_api_token(session)
+            if not api_token:
+                log.error("Failed to obtain API token. Exiting.")
+                sys.exit(1)
+            _store_token(api_token)
+            session.headers.update({"Authorization": api_token})
+            asset_record_id, item_details = get_asset_record_id(session, asset_id_tag)
+        if not asset_record_id:
+            log.error(f"Failed to find asset record ID for '{asset_id_tag}'. Skipping.")
+            continue
+        resolved.append((asset_id_tag, asset_record_id, item_details))
 
-        # The curl example for Authorization only uses the token, not "Bearer <token>"
-        # If your Homebox instance needs "Bearer ", adjust here or in helper functions.
-        # session.headers.update({"Authorization": f"Bearer {api_token}"})
-        session.headers.update({"Authorization": api_token})
-
+    if not resolved:
+        log.error("No asset tags could be resolved. Exiting.")
+        sys.exit(1)
 
-        asset_record_id = get_asset_record_id(session, asset_id_tag_input, api_token) # api_token passed for consistency, though session has it
-        if not asset_record_id:
-            print(f"Failed to find asset record ID for '{asset_id_tag_input}'. Exiting.")
-            sys.exit(1)
-        
-        item_details = get_asset_details(session, asset_record_id, api_token) # api_token passed for consistency
+    # Fill in whatever the search fast path didn't return. With several
+    # fetches outstanding, overlap them on the shared session — the adapter's
+    # pool_maxsize already covers four concurrent workers.
+    missing = [i for i, (_, _, item_details) in enumerate(resolved) if item_details is None]
+    if len(missing) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(get_asset_details, session, resolved[i][1]): i
+                for i in missing
+            }
+            for future in concurrent.futures.as_completed(futures):
+                i = futures[future]
+                resolved[i] = (resolved[i][0], resolved[i][1], future.result())
+    elif missing:
+        i = missing[0]
+        resolved[i] = (resolved[i][0], resolved[i][1], get_asset_details(session, resolved[i][1]))
+
+    # Render and submit one CUPS job per tag; the connection, queue check,
+    # compiled template, and session are all reused across the loop.
+    printed_count = 0
+    for asset_id_tag, asset_record_id, item_details in resolved:
         if not item_details:
-            print(f"Failed to fetch details for asset record ID '{asset_record_id}'. Exiting.")
-            sys.exit(1)
+            log.error(f"Failed to fetch details for asset record ID '{asset_record_id}'. Skipping.")
+            continue
 
-    if not item_details:
-        print("No asset data fetched. Cannot proceed.")
-        sys.exit(1)
-        
-    template_context = prepare_template_context(item_details)
-    print(f"\nUsing data for asset '{template_context.get('name', asset_id_tag_input)}': {template_context}")
+        template_context = prepare_template_context(item_details)
+        if log.isEnabledFor(logging.DEBUG):
+            # Only serialize the context when someone is actually going to see it.
+            context_preview = json.dumps(template_context, default=str)[:500]
+            log.debug(f"\nUsing data for asset '{template_context.get('name', asset_id_tag)}': {context_preview}")
 
-    rendered_zpl_string = render_zpl_template(zpl_template_file, template_context)
+        rendered_zpl_string = render_zpl_template(zpl_template_file, template_context)
+        if not rendered_zpl_string:
+            log.error(f"Failed to render ZPL template for '{asset_id_tag}'. Skipping.")
+            continue
+
+        log.info("\n--- Rendered ZPL ---")
+        log.info(rendered_zpl_string)
+        log.info("---------------------\n")
+
+        zpl_bytes_to_print = _encode_zpl(rendered_zpl_string)
 
-    if rendered_zpl_string:
-        print("\n--- Rendered ZPL ---")
-        print(rendered_zpl_string)
-        print("---------------------\n")
-        
-        zpl_bytes_to_print = rendered_zpl_string.encode('utf-8')
-        
         job_identifier = template_context.get('asset_id_tag', 'Unknown Asset')
         if template_context.get('name') and template_context.get('name') != 'N/A':
              job_identifier += f" ({template_context.get('name')})"
-        
-        _send_zpl_bytes_to_cups(zpl_bytes_to_print, job_title_identifier=job_identifier)
-    else:
-        print("Failed to render ZPL template. Nothing to print.")
+
+        if _send_zpl_bytes_to_cups(zpl_bytes_to_print, job_title_identifier=job_identifier):
+            printed_count += 1
+
+    if printed_count == 0:
+        log.error("No labels were printed. Exiting.")
         sys.exit(1)
+    if len(asset_id_tags) > 1:
+        log.info(f"Submitted {printed_count} of {len(asset_id_tags)} labels.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -11,10 +11,15 @@ and sends the rendered ZPL to a network printer via IPP (CUPS) for a single prin
 
 Usage:
   uv run print-plant.py <path_to_zpl_template.zpl> "<scientific>" "<afr>" "<eng>" "<sep>" "<region>" "<url>"
-  
+  uv run print-plant.py <path_to_zpl_template.zpl> --csv <path_to_data.csv>
+
 Example:
   uv run print-plant.py my_label_template.zpl "Dombeya rotundifolia" "drolpeer" "wild pear" "mohlabaphala" "magaliesberg" "https://url.site.com"
 
+In --csv mode, each row of the CSV becomes one label (column headers must
+match the template variable names) and all labels are submitted to CUPS as
+a single print job.
+
 ZPL Template Example (e.g., my_label_template.zpl):
   ^XA
   ^FT0,46^A0N,39,48^FH\^FD{{ scientific }}^FS
@@ -27,10 +32,16 @@ ZPL Template Example (e.g., my_label_template.zpl):
   ^XZ
 """
 
+import concurrent.futures
+import csv
+import functools
 import sys
 import os
+import re
+import socket
 import tempfile
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import threading
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
 
 # --- CUPS Configuration ---
 PRINTER_QUEUE_NAME = "Zebra-ZD421-203dpi-ZPL"  # Replace with your printer's queue name
@@ -38,64 +49,210 @@ CUPS_SERVER_IP = "192.168.2.63"  # Replace with your CUPS server IP
 CUPS_SERVER_PORT = 631
 # --- End CUPS Configuration ---
 
+# --- RAW (JetDirect) Configuration ---
+# Direct TCP-9100 printing bypasses the CUPS spooler and filter chain
+# entirely; enable with --raw or ZPL_RAW=1 on a trusted LAN.
+PRINTER_RAW_HOST = "192.168.2.64"  # Replace with your printer's IP
+PRINTER_RAW_PORT = 9100
+USE_RAW = os.environ.get('ZPL_RAW') == '1'
+# --- End RAW Configuration ---
+
+# Per-label progress messages are opt-in and buffered into a single stderr
+# write, so bulk runs don't pay a TTY flush per print() on the hot path.
+VERBOSE = os.environ.get('ZPL_VERBOSE') == '1'
+
+# On-disk cache of compiled template bytecode, shared across process starts
+# (analogous to CPython's __pycache__). A fresh CLI invocation then only has
+# to unpickle the compiled template instead of re-parsing it.
+_BYTECODE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'zpl_jinja_bc')
+os.makedirs(_BYTECODE_CACHE_DIR, exist_ok=True)
+_BYTECODE_CACHE = FileSystemBytecodeCache(directory=_BYTECODE_CACHE_DIR, pattern='%s.cache')
+
+# Template sources are read once and served to a single shared Environment
+# through a DictLoader, so Jinja never walks a search path or stats files
+# through a FileSystemLoader; a DictLoader still plugs into the bytecode
+# cache above, unlike Environment.from_string.
+_SOURCE_CACHE: dict[str, str] = {}
+_ENV = Environment(
+    loader=DictLoader(_SOURCE_CACHE),
+    # ZPL goes to the printer verbatim: HTML-style escaping would corrupt it,
+    # and autoescape=False lets Jinja skip the escape() wrapper per {{ var }}.
+    autoescape=False,
+    # Collapse block-tag whitespace at compile time: fewer write() calls per
+    # render and fewer filler bytes in the IPP payload.
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=False,
+    bytecode_cache=_BYTECODE_CACHE,
+    auto_reload=False,
+    cache_size=400
+)
+
+# Most ZPL templates here only do plain {{ var }} substitution, for which
+# Jinja's full lexer/parser/compiler is overkill. Such templates are converted
+# once to a str.format string and rendered with format_map; anything using
+# tags or filters falls back to the Jinja path below.
+_SIMPLE_VAR_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+# template path -> (mtime, format string); a None format string marks
+# templates that need the full Jinja path
+_SIMPLE_TEMPLATE_CACHE: dict[str, tuple[float, str | None]] = {}
+
+
+class _EmptyForMissing(dict):
+    """Mirrors Jinja's default of rendering undefined variables as ''."""
+    def __missing__(self, key):
+        return ''
+
+
+def _compile_simple_template(template_source):
+    """
+    Converts a pure {{ var }} template into a str.format string.
+    Returns None if the template uses any Jinja syntax beyond plain
+    variable substitution (tags, comments, filters, expressions).
+    """
+    if '{%' in template_source or '{#' in template_source:
+        return None
+    if template_source.endswith('\n'):
+        # Jinja drops a single trailing newline by default; match that.
+        template_source = template_source[:-1]
+    parts = _SIMPLE_VAR_RE.split(template_source)
+    pieces = []
+    for i, part in enumerate(parts):
+        if i % 2:  # variable name captured by _SIMPLE_VAR_RE
+            pieces.append('{%s}' % part)
+        else:
+            if '{{' in part or '}}' in part:  # filter or expression we can't handle
+                return None
+            pieces.append(part.replace('{', '{{').replace('}', '}}'))
+    return ''.join(pieces)
+
+
+def _simple_template_for(template_path):
+    """
+    Returns the cached str.format string for a pure-substitution template,
+    or None when the template needs the full Jinja path.
+    """
+    mtime = os.stat(template_path).st_mtime
+    cached = _SIMPLE_TEMPLATE_CACHE.get(template_path)
+    if cached is None or cached[0] != mtime:
+        with open(template_path, encoding='utf-8') as f:
+            template_source = f.read()
+        cached = (mtime, _compile_simple_template(template_source))
+        _SIMPLE_TEMPLATE_CACHE[template_path] = cached
+    return cached[1]
+
+def _render_simple_template(template_path, data_context):
+    """
+    Fast path for pure-substitution templates: one cached format_map call
+    instead of a Jinja compile + render. Returns None when the template
+    needs the full Jinja path.
+    """
+    compiled = _simple_template_for(template_path)
+    if compiled is None:
+        return None
+    return compiled.format_map(_EmptyForMissing(data_context))
+
 
-try:
-    import cups
-except ImportError:
-    print("Error: pycups library is not installed or not available on this system.")
-    print("If you are on Linux/macOS, ensure 'pycups' is in the script's dependencies.")
-    print("pycups is not available on Windows. For Windows, a different approach is needed.")
-    sys.exit(1)
+cups = None  # populated on first use by _load_cups()
+
+def _load_cups():
+    """
+    Imports pycups on first use. Render-only invocations (--dry-run) never
+    touch CUPS, so they skip the native-extension import entirely.
+    """
+    global cups
+    if cups is None:
+        try:
+            import cups as cups_module
+        except ImportError:
+            print("Error: pycups library is not installed or not available on this system.")
+            print("If you are on Linux/macOS, ensure 'pycups' is in the script's dependencies.")
+            print("pycups is not available on Windows. For Windows, a different approach is needed.")
+            sys.exit(1)
+        cups = cups_module
+    return cups
+
+@functools.lru_cache(maxsize=8)
+def _compiled_template(template_path, mtime):
+    """
+    Returns the compiled Template for (path, mtime). The mtime in the cache
+    key invalidates naturally when the file changes on disk.
+    """
+    with open(template_path, encoding='utf-8') as f:
+        _SOURCE_CACHE[template_path] = f.read()
+    _ENV.cache.clear()  # drop any Template compiled from an older source
+    return _ENV.get_template(template_path)
+
+def compile_zpl_template(template_path):
+    """
+    Returns the compiled jinja2.Template for the given path; repeated calls
+    for an unchanged file only pay a stat and a cache lookup.
+    """
+    return _compiled_template(template_path, os.path.getmtime(template_path))
 
 def render_zpl_template(template_path, data_context):
     """
     Renders a ZPL Jinja2 template with the given data context.
     Returns the rendered ZPL string or None if an error occurs.
+    A missing file surfaces from the single stat/open below, rather than
+    being pre-checked with extra os.path.exists calls.
     """
-    if not os.path.exists(template_path):
+    try:
+        rendered_zpl = _render_simple_template(template_path, data_context)
+        if rendered_zpl is not None:
+            return rendered_zpl
+        template = compile_zpl_template(template_path)
+        return template.render(data_context)
+    except FileNotFoundError:
         print(f"Error: ZPL template file not found at '{template_path}'")
         return None
-    
-    template_dir = os.path.dirname(template_path)
-    template_filename = os.path.basename(template_path)
-    
-    env = Environment(
-        loader=FileSystemLoader(template_dir if template_dir else '.'),
-        autoescape=select_autoescape(['html', 'xml', 'zpl']) # ZPL isn't an official autoescape target
-    )
-    
-    try:
-        template = env.get_template(template_filename)
-        rendered_zpl = template.render(data_context)
-        return rendered_zpl
     except Exception as e:
         print(f"Error rendering ZPL template '{template_path}': {e}")
         return None
 
+# Chunk size for streaming document data into the IPP request; keeps any one
+# write (and its libcups copy) bounded for large rendered labels.
+_CUPS_WRITE_CHUNK_SIZE = 32768
+
+_conn_local = threading.local()
+
+def _cups_conn():
+    """
+    Returns a cups.Connection cached per thread, shared by all labels that
+    thread prints in one run (libcups handles are not thread-safe, so
+    --parallel workers each get their own). The configured queue is
+    deliberately not validated here: a wrong queue name surfaces as an IPP
+    not-found error on submission, so the happy path costs a single
+    round-trip instead of two.
+    """
+    conn = getattr(_conn_local, 'conn', None)
+    if conn is None:
+        cups = _load_cups()
+        cups.setServer(CUPS_SERVER_IP)
+        cups.setPort(CUPS_SERVER_PORT)
+        conn = cups.Connection(host=CUPS_SERVER_IP, port=CUPS_SERVER_PORT)
+        _conn_local.conn = conn
+    return conn
+
+def _print_available_queues():
+    """Lists the server's printer queues; only called on the error path."""
+    try:
+        printers = _cups_conn().getPrinters()
+    except Exception:
+        return
+    print("Available printer queues on this server:")
+    for printer_name in printers:
+        print(f"  - {printer_name}")
+
 def _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier=""):
     """
     Internal function to send ZPL data (as bytes) to the CUPS printer.
-    Writes data to a temporary file first.
+    Streams the bytes directly into the IPP request; nothing touches disk.
     """
-    temp_file_path = None
+    cups = _load_cups()
     try:
-        cups.setServer(CUPS_SERVER_IP)
-        cups.setPort(CUPS_SERVER_PORT)
+        conn = _cups_conn()
 
-        conn = cups.Connection(host=CUPS_SERVER_IP, port=CUPS_SERVER_PORT)
-        
-        printers = conn.getPrinters()
-        if not printers:
-            print(f"Error: No printers found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
-            return False
-
-        if PRINTER_QUEUE_NAME not in printers:
-            print(f"Error: Printer queue '{PRINTER_QUEUE_NAME}' not found on server {CUPS_SERVER_IP}:{CUPS_SERVER_PORT}.")
-            print("Available printer queues on this server:")
-            for printer_name in printers:
-                print(f"  - {printer_name}")
-            return False
-        
         options = {
             'document-format': 'application/octet-stream', 
             'raw': 'true'
@@ -104,19 +261,26 @@ def _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier=""):
         base_job_title = "Homebox ZPL Print"
         job_title = f"{base_job_title}: {job_title_identifier}" if job_title_identifier else base_job_title
         
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.zpl') as tmp:
-            tmp.write(zpl_data_bytes)
-            temp_file_path = tmp.name
-        
-        print(f"Sending ZPL data from temporary file '{temp_file_path}' to printer '{PRINTER_QUEUE_NAME}' (Job: '{job_title}')...")
-        job_id = conn.printFile(PRINTER_QUEUE_NAME, temp_file_path, job_title, options)
-        
-        print(f"Successfully submitted print job. Job ID: {job_id}")
+        job_id = conn.createJob(PRINTER_QUEUE_NAME, job_title, options)
+        conn.startDocument(PRINTER_QUEUE_NAME, job_id, job_title, 'application/octet-stream', 1)
+        mv = memoryview(zpl_data_bytes)
+        for i in range(0, len(mv), _CUPS_WRITE_CHUNK_SIZE):
+            chunk = bytes(mv[i:i + _CUPS_WRITE_CHUNK_SIZE])
+            conn.writeRequestData(chunk, len(chunk))
+        conn.finishDocument(PRINTER_QUEUE_NAME)
+
+        if VERBOSE:
+            sys.stderr.write(
+                f"Streamed {len(zpl_data_bytes)} bytes of ZPL to printer '{PRINTER_QUEUE_NAME}' (Job: '{job_title}').\n"
+                f"Successfully submitted print job. Job ID: {job_id}\n")
         return True
 
     except cups.IPPError as e:
+        status = e.args[0] if e.args else None
         print(f"IPPError communicating with CUPS/IPP server: {e}")
         print(f"Details: Server={CUPS_SERVER_IP}:{CUPS_SERVER_PORT}, Queue={PRINTER_QUEUE_NAME}")
+        if status == cups.IPP_NOT_FOUND:
+            _print_available_queues()
         return False
     except RuntimeError as e:
         print(f"RuntimeError (often connection-related with CUPS): {e}")
@@ -124,33 +288,162 @@ def _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier=""):
     except Exception as e:
         print(f"An unexpected error occurred during printing: {e}")
         return False
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except OSError as e:
-                print(f"Warning: Could not delete temporary file '{temp_file_path}': {e}")
+
+def _send_zpl_raw(zpl_data_bytes, host=PRINTER_RAW_HOST, port=PRINTER_RAW_PORT):
+    """
+    Sends ZPL straight to the printer's JetDirect (RAW, TCP 9100) port:
+    one connect + sendall, no spooler, no filter chain, no IPP envelope.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=5) as s:
+            s.sendall(zpl_data_bytes)
+    except OSError as e:
+        print(f"Error sending ZPL to {host}:{port}: {e}")
+        return False
+    if VERBOSE:
+        sys.stderr.write(f"Sent {len(zpl_data_bytes)} bytes of ZPL to {host}:{port} (RAW).\n")
+    return True
+
+def _send_zpl_bytes(zpl_data_bytes, job_title_identifier=""):
+    """Routes to the RAW socket or the CUPS path, depending on USE_RAW."""
+    if USE_RAW:
+        return _send_zpl_raw(zpl_data_bytes)
+    return _send_zpl_bytes_to_cups(zpl_data_bytes, job_title_identifier)
+
+def _encode_zpl(rendered_zpl):
+    """
+    Encodes rendered ZPL for the wire. Labels are almost always pure ASCII
+    (extended chars go through ^CI17 escapes), so take the ASCII fast path —
+    a straight copy of the compact string buffer — and only fall back to the
+    general UTF-8 encoder when needed.
+    """
+    if rendered_zpl.isascii():
+        return rendered_zpl.encode('ascii')
+    return rendered_zpl.encode('utf-8')
+
+# Candidate columns for a human-readable job identifier, checked in order.
+_JOB_ID_KEYS = ('scientific', 'name', 'id')
+
+def _pick_job_id(row, fieldnames):
+    """Picks a job identifier for a row: the first populated key from
+    _JOB_ID_KEYS, else the row's first column, else 'row'."""
+    return next((str(row[k]) for k in _JOB_ID_KEYS if row.get(k)),
+                str(row[fieldnames[0]]) if fieldnames else 'row')
+
+def print_labels_from_csv(zpl_template_file, csv_data_file, dry_run=False, parallel_workers=0):
+    """
+    Renders one label per CSV row and submits them all as a single CUPS job.
+    Zebra printers execute concatenated ^XA...^XZ blocks serially from one
+    stream, so one Create-Job + Send-Document covers the whole file instead
+    of paying per-job submission overhead for every row.
+
+    With parallel_workers > 0 each row becomes its own CUPS job instead,
+    submitted from a thread pool with one connection per worker — useful
+    when per-row job accounting or error isolation matters more than the
+    single-job submission saving.
+    """
+    # Compile once, render per row: only Template.render (or a format_map
+    # call for pure-substitution templates) runs inside the loop. Rows are
+    # streamed straight off the DictReader, and the single-job payload grows
+    # in-place in one bytearray (amortized O(1) extends) instead of holding
+    # every label and paying a join copy at the end. --parallel keeps per-row
+    # payloads separate since each row becomes its own job.
+    buf = bytearray()
+    buf_extend = buf.extend  # hoist the attribute lookup out of the loop
+    encoded_labels = []  # only populated in parallel mode
+    row_job_ids = []
+    label_count = 0
+    try:
+        simple_format = _simple_template_for(zpl_template_file)
+        if simple_format is not None:
+            def render(record):
+                return simple_format.format_map(_EmptyForMissing(record))
+        else:
+            render = compile_zpl_template(zpl_template_file).render
+        with open(csv_data_file, newline='') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                row_job_ids.append(_pick_job_id(record, reader.fieldnames))
+                encoded = _encode_zpl(render(record))
+                if parallel_workers:
+                    encoded_labels.append(encoded)
+                else:
+                    if label_count:
+                        buf_extend(b'\n')
+                    buf_extend(encoded)
+                label_count += 1
+    except FileNotFoundError as e:
+        print(f"Error: file not found: '{e.filename}'")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error rendering ZPL template '{zpl_template_file}': {e}")
+        sys.exit(1)
+
+    if not label_count:
+        print(f"Warning: no data rows found in '{csv_data_file}'. Nothing to print.")
+        sys.exit(0)
+
+    if dry_run:
+        preview = b'\n'.join(encoded_labels) if parallel_workers else bytes(buf)
+        print("\n--- Rendered ZPL ---")
+        print(preview.decode('utf-8'))
+        print("---------------------\n")
+        return
+
+    if parallel_workers:
+        print(f"Submitting {label_count} labels from '{csv_data_file}' "
+              f"as separate jobs on {parallel_workers} workers...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+            futures = [
+                executor.submit(_send_zpl_bytes, encoded, row_job_id)
+                for encoded, row_job_id in zip(encoded_labels, row_job_ids)
+            ]
+            if not all(f.result() for f in concurrent.futures.as_completed(futures)):
+                sys.exit(1)
+        return
+
+    print(f"Submitting {label_count} labels from '{csv_data_file}' as one print job...")
+    job_identifier = f"{label_count} labels from {os.path.basename(csv_data_file)} ({row_job_ids[0]}, ...)"
+    if not _send_zpl_bytes(bytes(buf), job_title_identifier=job_identifier):
+        sys.exit(1)
 
 def main():
-    if len(sys.argv) != 11:
-        print('Usage: uv run print-plant.py <path_to_zpl_template.zpl> "<scientific>" "<afr>" "<eng>" "<sep>" "<region>" "<url>" "<planted_date>" "<flowering_range>" "<local_lang>"')
+    global USE_RAW
+    # --dry-run renders and prints the ZPL without ever importing pycups.
+    dry_run = '--dry-run' in sys.argv
+    if '--raw' in sys.argv:
+        USE_RAW = True
+    argv = [arg for arg in sys.argv if arg not in ('--dry-run', '--raw')]
+
+    parallel_workers = 0
+    if '--parallel' in argv:
+        flag_index = argv.index('--parallel')
+        argv.pop(flag_index)
+        if flag_index < len(argv) and argv[flag_index].isdigit():
+            parallel_workers = int(argv.pop(flag_index))
+        else:
+            parallel_workers = 4
+
+    if len(argv) == 4 and argv[2] == '--csv':
+        print_labels_from_csv(argv[1], argv[3], dry_run=dry_run, parallel_workers=parallel_workers)
+        return
+
+    if len(argv) != 11:
+        print('Usage: uv run print-plant.py <path_to_zpl_template.zpl> "<scientific>" "<afr>" "<eng>" "<sep>" "<region>" "<url>" "<planted_date>" "<flowering_range>" "<local_lang>" [--dry-run] [--raw]')
+        print('       uv run print-plant.py <path_to_zpl_template.zpl> --csv <path_to_data.csv> [--dry-run] [--raw] [--parallel [N]]')
         print('Example: uv run print-plant.py my_label_template.zpl "Dombeya rotundifolia" "drolpeer" "wild pear" "mohlabaphala" "magaliesberg" "https://url.site.com" "Sep 24" "Sep-Oct" "NSO"')
         sys.exit(1)
-    
-    zpl_template_file = sys.argv[1]
-    scientific = sys.argv[2]
-    afr = sys.argv[3]
-    eng = sys.argv[4]
-    sep = sys.argv[5]
-    region = sys.argv[6]
-    url = sys.argv[7]
-    planted_date = sys.argv[8]
-    flowering_range = sys.argv[9]
-    local_lang = sys.argv[10]
-
-    if not os.path.exists(zpl_template_file):
-        print(f"Error: ZPL template file not found at '{zpl_template_file}'")
-        sys.exit(1)
+
+    zpl_template_file = argv[1]
+    scientific = argv[2]
+    afr = argv[3]
+    eng = argv[4]
+    sep = argv[5]
+    region = argv[6]
+    url = argv[7]
+    planted_date = argv[8]
+    flowering_range = argv[9]
+    local_lang = argv[10]
 
     template_context = {
         "scientific": scientific,
@@ -171,12 +464,15 @@ def main():
         print("\n--- Rendered ZPL ---")
         print(rendered_zpl_string)
         print("---------------------\n")
+
+        if dry_run:
+            return
+
+        zpl_bytes_to_print = _encode_zpl(rendered_zpl_string)
         
-        zpl_bytes_to_print = rendered_zpl_string.encode('utf-8')
-        
-        job_identifier = template_context.get('scientific', 'Unknown Plant')
+        job_identifier = _pick_job_id(template_context, list(template_context))
 
-        _send_zpl_bytes_to_cups(zpl_bytes_to_print, job_title_identifier=job_identifier)
+        _send_zpl_bytes(zpl_bytes_to_print, job_title_identifier=job_identifier)
     else:
         print("Failed to render ZPL template. Nothing to print.")
         sys.exit(1)